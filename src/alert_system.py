@@ -4,7 +4,9 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import os
 from dotenv import load_dotenv
+from src.metrics import timed, timer, increment
 
+@timed('generate_alerts')
 def generate_alerts(predictions, threshold=0.7):
     """
     Gera alertas quando o risco excede um limiar
@@ -40,6 +42,8 @@ def generate_alerts(predictions, threshold=0.7):
     
     # Converter para DataFrame
     alerts_df = pd.DataFrame(alerts)
+    increment('rows_processed_total', predictions.shape[0], stage='generate_alerts')
+    increment('alerts_total', alerts_df.shape[0])
     
     # Enviar alertas por email se houver novos
     if not alerts_df.empty:
@@ -47,6 +51,7 @@ def generate_alerts(predictions, threshold=0.7):
     
     return alerts_df
 
+@timed('send_email_alerts')
 def send_email_alerts(alerts_df):
     """Envia alertas por email"""
     load_dotenv()
@@ -80,11 +85,14 @@ def send_email_alerts(alerts_df):
     
     # Enviar email
     try:
-        server = smtplib.SMTP(email_host, email_port)
-        server.starttls()
-        server.login(email_user, email_password)
-        server.sendmail(email_user, recipient, msg.as_string())
-        server.quit()
+        with timer('smtp'):
+            server = smtplib.SMTP(email_host, email_port)
+            server.starttls()
+            server.login(email_user, email_password)
+            server.sendmail(email_user, recipient, msg.as_string())
+            server.quit()
+        increment('emails_sent_total')
         print(f"📧 Alertas enviados por email para {recipient}")
     except Exception as e:
+        increment('emails_failed_total')
         print(f"❌ Erro ao enviar email: {e}")
\ No newline at end of file
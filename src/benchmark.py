@@ -0,0 +1,487 @@
+import gc
+import os
+import sys
+import json
+import time
+import ctypes
+import threading
+import logging
+import platform
+import argparse
+import tempfile
+import sqlite3
+import subprocess
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+from src.synthetic_data import iter_synthetic_chunks, write_sql, generate_synthetic_data
+from src.data_loader import load_data
+from src.preprocessor import DataPreprocessor
+from src.model import predict, get_template_encoder, TemplateEncoder
+from src.alert_system import generate_alerts
+from src.dashboard import create_dashboard
+from src.metrics import REGISTRY
+
+# Configurar logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+TEMPLATE_WORDS = [
+    'relatório', 'de', 'em', 'temp', 'umidade', 'precipitação', 'casos',
+    'teófilo', 'otoni', 'diamantina', 'municipio', 'mm', 'nan'
+]
+
+
+def build_tiny_model(model_dir):
+    """
+    Cria um BERT minúsculo e um tokenizer locais (sem acesso à rede)
+
+    Os pesos são aleatórios: o objetivo é medir o custo do pipeline, não a
+    qualidade das previsões.
+    """
+    import torch
+    from transformers import BertConfig, BertForSequenceClassification, BertTokenizerFast
+
+    chars = list('abcdefghijklmnopqrstuvwxyzáâãàçéêíóôõú0123456789')
+    vocab = ['[PAD]', '[UNK]', '[CLS]', '[SEP]', '[MASK]']
+    vocab += chars + [f'##{c}' for c in chars] + list('.,:;%°-+_()')
+    vocab += [w for w in TEMPLATE_WORDS if w not in vocab]
+
+    vocab_file = os.path.join(model_dir, 'vocab.txt')
+    with open(vocab_file, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(vocab))
+    tokenizer = BertTokenizerFast(vocab_file=vocab_file)
+
+    torch.manual_seed(0)
+    config = BertConfig(
+        vocab_size=len(vocab),
+        hidden_size=32,
+        num_hidden_layers=2,
+        num_attention_heads=2,
+        intermediate_size=64,
+        max_position_embeddings=512,
+        num_labels=3
+    )
+    model = BertForSequenceClassification(config).eval()
+    return model, tokenizer
+
+
+def check_template_encoding(tokenizer, n_rows=2000, seed=42):
+    """
+    Confere que `TemplateEncoder` gera os mesmos `input_ids` que o tokenizer
+
+    Cobre linhas sintéticas (brutas e pré-processadas, com valores negativos),
+    municípios com espaços e acentos, zeros, NaN, contagens inteiras e
+    truncamento em `max_length`.
+
+    Raises:
+        RuntimeError: se algum caso divergir
+    """
+    raw = generate_synthetic_data(n_municipios=20, n_anos=1, seed=seed)
+    processed = DataPreprocessor().preprocess(raw.copy())
+
+    data = pd.Timestamp('2024-02-29')
+    # Contagens inteiras (int64) e contagens float em DataFrames separados
+    bordas_int = pd.DataFrame([
+        {'data': data, 'municipio': 'São João del-Rei', 'temperatura': 0.0, 'umidade': -0.0,
+         'precipitacao': -0.004, 'casos_dengue': 0, 'casos_zika': 0, 'casos_chikungunya': 0},
+        {'data': data, 'municipio': "Santa Bárbara d'Oeste", 'temperatura': -1.2345, 'umidade': float('nan'),
+         'precipitacao': 0.25, 'casos_dengue': 11, 'casos_zika': 4, 'casos_chikungunya': 0},
+    ])
+    bordas_float = pd.DataFrame([
+        {'data': data, 'municipio': 'Itaúna', 'temperatura': float('nan'), 'umidade': 99.999,
+         'precipitacao': 1e6, 'casos_dengue': 7.0, 'casos_zika': 2.5, 'casos_chikungunya': -3.0},
+    ])
+    # Nome longo o bastante para passar de 512 tokens
+    longo = bordas_int.head(1).assign(municipio=' '.join(['Conceição do Mato Dentro'] * 150))
+
+    casos = [
+        ('brutas', TemplateEncoder(tokenizer), raw.sample(n_rows, random_state=seed)),
+        ('pré-processadas', TemplateEncoder(tokenizer), processed.sample(n_rows, random_state=seed)),
+        ('bordas (int)', TemplateEncoder(tokenizer), bordas_int),
+        ('bordas (float)', TemplateEncoder(tokenizer), bordas_float),
+        ('truncamento 512', TemplateEncoder(tokenizer), longo),
+        ('truncamento 24', TemplateEncoder(tokenizer, max_length=24), processed.head(200)),
+    ]
+    for nome, encoder, df in casos:
+        if not encoder.verify(df):
+            raise RuntimeError(f"Codificação do template difere do tokenizer (caso: {nome})")
+    if TemplateEncoder(tokenizer).encode_ids(longo.to_dict('records')[0]).shape[0] != 512:
+        raise RuntimeError("Truncamento do template não respeitou max_length")
+
+    # Contagens inteiras mantêm o texto original (D11, não D11.0)
+    esperado = (
+        "Relatório de Santa Bárbara d'Oeste em 2024-02-29 00:00:00: "
+        "Temp: -1.23°C, Umidade: nan%, Precipitação: 0.25mm. Casos: D11 Z4 C0"
+    )
+    texto = TemplateEncoder(tokenizer).format_text(bordas_int.to_dict('records')[1])
+    if texto != esperado:
+        raise RuntimeError(f"Texto do relatório inesperado: {texto!r}")
+
+    logging.info(f"Codificação do template conferida com o tokenizer ({len(casos)} casos)")
+    return True
+
+
+# Amostras mínimas para um percentil significar algo (abaixo disso ele só
+# interpola em direção ao máximo e é gravado como null)
+MIN_SAMPLES = {'p95': 20, 'p99': 100}
+
+
+def _latency_stats(latencies):
+    """Resumo das latências em milissegundos"""
+    ms = np.array(latencies) * 1000
+    stats = {
+        'samples': int(ms.shape[0]),
+        'mean': float(ms.mean()),
+        'min': float(ms.min()),
+        'p50': float(np.percentile(ms, 50)),
+        'max': float(ms.max())
+    }
+    for nome, minimo in MIN_SAMPLES.items():
+        q = float(nome[1:])
+        stats[nome] = float(np.percentile(ms, q)) if ms.shape[0] >= minimo else None
+    return stats
+
+
+def _fmt_ms(value, decimals=1):
+    """Latência formatada para o log ('n/d' quando o percentil não foi calculado)"""
+    return f"{value:.{decimals}f}ms" if value is not None else "n/d"
+
+
+def _current_rss():
+    """RSS atual do processo em bytes (None se não houver como medir)"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _release_free_memory():
+    """Devolve ao sistema a memória livre do alocador (glibc), para o RSS refletir o uso real"""
+    gc.collect()
+    try:
+        ctypes.CDLL('libc.so.6').malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+
+
+def measure_peak_rss(func, arg, interval=0.001):
+    """
+    Pico de RSS acima do valor inicial durante `func(arg)`, em bytes
+
+    Amostra o RSS do processo numa thread, então inclui tensores do torch e
+    outras alocações fora do Python. Retorna None se o RSS não puder ser lido.
+    """
+    _release_free_memory()
+    baseline = _current_rss()
+    if baseline is None:
+        return None
+
+    peak = [baseline]
+    done = threading.Event()
+
+    def sample():
+        while not done.is_set():
+            peak[0] = max(peak[0], _current_rss())
+            done.wait(interval)
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    try:
+        func(arg)
+    finally:
+        done.set()
+        sampler.join()
+    peak[0] = max(peak[0], _current_rss())
+    return peak[0] - baseline
+
+
+def run_stage(name, setup, func, n_rows, repeats=5, warmup=1, per_row=None):
+    """
+    Mede uma etapa do pipeline
+
+    Args:
+        name: Nome da etapa
+        setup: Função que prepara o argumento de cada execução (fora da medição)
+        func: Função medida, recebe o retorno de `setup`
+        n_rows: Registros processados por execução (para a vazão)
+        repeats: Execuções medidas
+        warmup: Execuções descartadas antes da medição
+        per_row: Etapas de `timer` medidas por registro dentro de `func`
+            (ex.: 'predict.tokenize'); viram percentis por registro, e a
+            soma delas, 'row', a latência de cada registro
+
+    Returns:
+        (dicionário com as métricas, retorno da última execução)
+    """
+    for _ in range(warmup):
+        func(setup())
+
+    latencies = []
+    with REGISTRY.capture(*(per_row or ())) as amostras:
+        for _ in range(repeats):
+            arg = setup()
+            start = time.perf_counter()
+            result = func(arg)
+            latencies.append(time.perf_counter() - start)
+
+    # Pico de memória (RSS) medido numa execução separada, fora da medição de tempo
+    peak = measure_peak_rss(func, setup())
+
+    stats = _latency_stats(latencies)
+    metrics = {
+        'stage': name,
+        'rows': int(n_rows),
+        'repeats': repeats,
+        'latency_ms': stats,
+        'throughput_rows_s': n_rows / (stats['p50'] / 1000) if stats['p50'] > 0 else None,
+        'peak_memory_mb': peak / 2**20 if peak is not None else None
+    }
+
+    if per_row and all(amostras.values()):
+        metrics['per_row_latency_ms'] = {
+            etapa: _latency_stats(valores) for etapa, valores in amostras.items()
+        }
+        metrics['per_row_latency_ms']['row'] = _latency_stats(np.sum(list(amostras.values()), axis=0))
+
+    pico = f"{metrics['peak_memory_mb']:.1f}MB" if peak is not None else "n/d"
+    logging.info(
+        f"{name}: p50={_fmt_ms(stats['p50'])} p95={_fmt_ms(stats['p95'])} rows={n_rows} pico={pico}"
+    )
+    if 'per_row_latency_ms' in metrics:
+        row = metrics['per_row_latency_ms']['row']
+        logging.info(
+            f"{name} por registro: p50={_fmt_ms(row['p50'], 2)} p95={_fmt_ms(row['p95'], 2)} "
+            f"p99={_fmt_ms(row['p99'], 2)} ({row['samples']} amostras)"
+        )
+    return metrics, result
+
+
+def _dashboard_callback(app, output):
+    """Função original de um callback do Dash (sem o contexto da requisição)"""
+    return app.callback_map[output]['callback'].__wrapped__
+
+
+def benchmark_size(n_municipios, n_anos, model, tokenizer, workdir,
+                   repeats=5, max_predict_rows=None, threshold=0.0, seed=42):
+    """Executa todas as etapas do pipeline para um tamanho de dados"""
+    size = {'municipios': n_municipios, 'anos': n_anos}
+    results = []
+
+    def record(metrics):
+        metrics.update(size)
+        results.append(metrics)
+
+    # Banco SQLite local com as tabelas brutas
+    db_path = os.path.join(workdir, f'bench_{n_municipios}x{n_anos}.sqlite')
+    con = sqlite3.connect(db_path)
+    try:
+        write_sql(iter_synthetic_chunks(n_municipios, n_anos, seed, hourly=True, raw=True), con)
+    finally:
+        con.close()
+    os.environ['DB_URL'] = f'sqlite:///{db_path}'
+
+    # 1. Carregamento
+    # load_data cai no fallback em qualquer erro: conferir que o SQLite foi lido
+    n_daily = n_municipios * n_anos * 365
+    raw_df = load_data(municipios=None)
+    if raw_df.shape[0] != n_daily or raw_df['municipio'].nunique() != n_municipios:
+        raise RuntimeError(
+            f"load_data retornou {raw_df.shape[0]} registros de {raw_df['municipio'].nunique()} "
+            f"municípios (esperado {n_daily} de {n_municipios}): o banco SQLite não foi lido"
+        )
+
+    # Vazão pelos registros lidos das duas tabelas (dados_climaticos é horária)
+    con = sqlite3.connect(db_path)
+    try:
+        n_read = sum(
+            con.execute(f"SELECT COUNT(*) FROM {tabela}").fetchone()[0]
+            for tabela in ('dados_climaticos', 'dados_arboviroses')
+        )
+    finally:
+        con.close()
+
+    metrics, raw_df = run_stage(
+        'load_data', lambda: None, lambda _: load_data(municipios=None), n_read, repeats
+    )
+    record(metrics)
+
+    # 2. Pré-processamento
+    metrics, processed_df = run_stage(
+        'preprocess', raw_df.copy, lambda df: DataPreprocessor().preprocess(df),
+        raw_df.shape[0], repeats
+    )
+    record(metrics)
+
+    # 3. Previsão
+    predict_df = processed_df.head(max_predict_rows) if max_predict_rows else processed_df
+    metrics, predictions = run_stage(
+        'predict', lambda: predict_df, lambda df: predict(df, model, tokenizer),
+        predict_df.shape[0], repeats, per_row=('predict.tokenize', 'predict.forward')
+    )
+    metrics['template_encoding_identical'] = get_template_encoder(tokenizer).verify(predict_df.head(500))
+    record(metrics)
+
+    # 4. Alertas
+    metrics, alerts = run_stage(
+        'generate_alerts', lambda: predictions,
+        lambda df: generate_alerts(df, threshold=threshold),
+        predictions.shape[0], repeats
+    )
+    record(metrics)
+
+    # 5. Callbacks do dashboard
+    app = create_dashboard(processed_df, predictions, alerts)
+    municipio = processed_df['municipio'].iloc[0]
+    start_date = processed_df['data'].min().isoformat()
+    end_date = processed_df['data'].max().isoformat()
+    n_municipio = int((processed_df['municipio'] == municipio).sum())
+
+    filter_data = _dashboard_callback(app, 'filtered-data.data')
+    metrics, filtered = run_stage(
+        'dashboard.filter_data', lambda: None,
+        lambda _: filter_data(municipio, start_date, end_date),
+        n_municipio, repeats
+    )
+    record(metrics)
+
+    figure_callbacks = [
+        ('dashboard.update_casos_grafico', 'casos-temporais.figure', (filtered,)),
+        ('dashboard.update_previsoes_grafico', 'previsoes-grafico.figure', (filtered, municipio)),
+        ('dashboard.update_mapa_calor', 'mapa-calor.figure', (filtered,)),
+        ('dashboard.update_correlacao_clima', 'correlacao-clima.figure', (filtered,)),
+        ('dashboard.update_alertas', 'alertas-container.children', (municipio,)),
+    ]
+    for name, output, args in figure_callbacks:
+        callback = _dashboard_callback(app, output)
+        metrics, _ = run_stage(name, lambda: args, lambda a: callback(*a), n_municipio, repeats)
+        record(metrics)
+
+    return results
+
+
+def _git_commit():
+    """Commit atual do repositório (None fora de um checkout git)"""
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', 'HEAD'], stderr=subprocess.DEVNULL, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).strip()
+    except Exception:
+        return None
+
+
+def compare_results(baseline_path, current_path, tolerance=1.2):
+    """
+    Compara a latência p50 de duas execuções
+
+    Returns:
+        Lista de regressões (etapas cuja p50 cresceu mais que `tolerance`)
+    """
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)
+    with open(current_path, encoding='utf-8') as f:
+        current = json.load(f)
+
+    # Só compara execuções com a mesma quantidade de registros
+    def key(r):
+        return (r['stage'], r['municipios'], r['anos'], r['rows'])
+
+    base = {key(r): r for r in baseline['results']}
+    regressions = []
+    print(f"{'etapa':40} {'tamanho':>10} {'p50 base':>12} {'p50 atual':>12} {'razão':>8}")
+    for r in current['results']:
+        old = base.get(key(r))
+        if old is None:
+            continue
+        ratio = r['latency_ms']['p50'] / old['latency_ms']['p50'] if old['latency_ms']['p50'] else float('inf')
+        flag = ' ⚠' if ratio > tolerance else ''
+        print(
+            f"{r['stage']:40} {r['municipios']:>5}x{r['anos']:<4} "
+            f"{old['latency_ms']['p50']:>10.1f}ms {r['latency_ms']['p50']:>10.1f}ms {ratio:>7.2f}x{flag}"
+        )
+        if ratio > tolerance:
+            regressions.append({'stage': r['stage'], 'municipios': r['municipios'],
+                                'anos': r['anos'], 'ratio': ratio})
+    return regressions
+
+
+def _parse_sizes(value):
+    """Converte '2x1,50x2' em [(2, 1), (50, 2)]"""
+    sizes = []
+    for item in value.split(','):
+        municipios, anos = item.lower().split('x')
+        sizes.append((int(municipios), int(anos)))
+    return sizes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark das etapas do pipeline de arboviroses")
+    parser.add_argument('--sizes', type=_parse_sizes, default=_parse_sizes('2x1,10x1,50x2'),
+                        help="Tamanhos no formato MUNICIPIOSxANOS separados por vírgula")
+    parser.add_argument('--repeats', type=int, default=5,
+                        help="Execuções por etapa (p95/p99 da etapa exigem 20/100; "
+                             "predict também grava percentis por registro)")
+    parser.add_argument('--max-predict-rows', type=int, default=2000,
+                        help="Limita os registros enviados ao modelo (0 envia todos)")
+    parser.add_argument('--threshold', type=float, default=0.0,
+                        help="Limiar de alerta (0 gera alerta para todos os registros)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--compare', metavar='BASELINE',
+                        help="Compara o resultado com uma execução anterior")
+    parser.add_argument('--tolerance', type=float, default=1.2)
+    parser.add_argument('--verify-only', action='store_true',
+                        help="Só confere a codificação do template com o tokenizer")
+    args = parser.parse_args()
+
+    # Nunca enviar emails durante o benchmark
+    os.environ['EMAIL_USER'] = ''
+
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        model, tokenizer = build_tiny_model(workdir)
+        check_template_encoding(tokenizer, seed=args.seed)
+        if args.verify_only:
+            return
+        for n_municipios, n_anos in args.sizes:
+            logging.info(f"Benchmark: {n_municipios} municípios x {n_anos} anos")
+            results += benchmark_size(
+                n_municipios, n_anos, model, tokenizer, workdir,
+                repeats=args.repeats, max_predict_rows=args.max_predict_rows,
+                threshold=args.threshold, seed=args.seed
+            )
+
+    output = {
+        'meta': {
+            'commit': _git_commit(),
+            'timestamp': datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeats': args.repeats,
+            'max_predict_rows': args.max_predict_rows,
+            'threshold': args.threshold,
+            'seed': args.seed,
+            'template_encoding_verified': True
+        },
+        'results': results
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(output, f, indent=2, ensure_ascii=False)
+    print(f"📊 Resultados salvos em {args.output}")
+
+    if args.compare:
+        regressions = compare_results(args.compare, args.output, args.tolerance)
+        if regressions:
+            print(f"🚨 {len(regressions)} regressões acima de {args.tolerance:.2f}x")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,9 +3,11 @@ import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import pandas as pd
+from src.metrics import timed, increment, register_metrics_endpoint
 
 def create_dashboard(df, predictions, alerts):
     app = Dash(__name__)
+    register_metrics_endpoint(app.server)
     
     # Estilos
     styles = {
@@ -89,10 +91,12 @@ def create_dashboard(df, predictions, alerts):
         Input('date-picker', 'start_date'),
         Input('date-picker', 'end_date')
     )
+    @timed('dashboard.filter_data')
     def filter_data(municipio, start_date, end_date):
         filtered_df = df[df['municipio'] == municipio]
         filtered_df = filtered_df[(filtered_df['data'] >= start_date) & 
                                  (filtered_df['data'] <= end_date)]
+        increment('rows_processed_total', filtered_df.shape[0], stage='dashboard.filter_data')
         return filtered_df.to_json(date_format='iso', orient='split')
     
     # Callback para gráfico de casos temporais
@@ -100,6 +104,7 @@ def create_dashboard(df, predictions, alerts):
         Output('casos-temporais', 'figure'),
         Input('filtered-data', 'data')
     )
+    @timed('dashboard.update_casos_grafico')
     def update_casos_grafico(data):
         if data is None:
             return go.Figure()
@@ -151,6 +156,7 @@ def create_dashboard(df, predictions, alerts):
         Input('filtered-data', 'data'),
         Input('municipio-dropdown', 'value')
     )
+    @timed('dashboard.update_previsoes_grafico')
     def update_previsoes_grafico(data, municipio):
         if data is None:
             return go.Figure()
@@ -199,6 +205,7 @@ def create_dashboard(df, predictions, alerts):
         Output('mapa-calor', 'figure'),
         Input('filtered-data', 'data')
     )
+    @timed('dashboard.update_mapa_calor')
     def update_mapa_calor(data):
         if data is None:
             return go.Figure()
@@ -227,6 +234,7 @@ def create_dashboard(df, predictions, alerts):
         Output('correlacao-clima', 'figure'),
         Input('filtered-data', 'data')
     )
+    @timed('dashboard.update_correlacao_clima')
     def update_correlacao_clima(data):
         if data is None:
             return go.Figure()
@@ -261,6 +269,7 @@ def create_dashboard(df, predictions, alerts):
         Output('alertas-container', 'children'),
         Input('municipio-dropdown', 'value')
     )
+    @timed('dashboard.update_alertas')
     def update_alertas(municipio):
         if alerts.empty:
             return html.P("Nenhum alerta recente.")
@@ -1,21 +1,41 @@
 import psycopg2
+import sqlite3
 import pandas as pd
 import os
 import logging
-import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime
 from dateutil.relativedelta import relativedelta
+from src.metrics import timed, timer, increment
 
 # Configurar logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-def load_data():
+# Municípios monitorados (filtro padrão de load_data)
+MUNICIPIOS = ['Teófilo Otoni', 'Diamantina']
+
+def connect(db_url=None):
+    """Abre a conexão com o banco (Postgres, ou SQLite com `sqlite:///arquivo`)"""
+    db_url = db_url or os.getenv('DB_URL')
+    if db_url and db_url.startswith('sqlite:///'):
+        return sqlite3.connect(db_url[len('sqlite:///'):])
+    return psycopg2.connect(db_url)
+
+@timed('load_data')
+def load_data(municipios=MUNICIPIOS):
     """Carrega e une dados climáticos e de arboviroses de tabelas diferentes"""
     try:
-        conn = psycopg2.connect(os.getenv('DB_URL'))
+        conn = connect()
+        
+        # Filtro de municípios (None carrega todos)
+        if municipios:
+            placeholder = '?' if isinstance(conn, sqlite3.Connection) else '%s'
+            where = f"WHERE municipio IN ({', '.join([placeholder] * len(municipios))})"
+            params = list(municipios)
+        else:
+            where, params = "", None
         
         # 1. Carregar dados climáticos
-        climate_query = """
+        climate_query = f"""
             SELECT 
                 data_hora AS data,
                 municipio,
@@ -23,13 +43,15 @@ def load_data():
                 umidade_media AS umidade,
                 precipitacao
             FROM dados_climaticos
-            WHERE municipio IN ('Teófilo Otoni', 'Diamantina');
+            {where};
         """
-        climate_df = pd.read_sql(climate_query, conn)
+        with timer('db_query', table='dados_climaticos'):
+            climate_df = pd.read_sql(climate_query, conn, params=params)
+        increment('rows_processed_total', climate_df.shape[0], stage='load_data', table='dados_climaticos')
         logging.info(f"Dados climáticos carregados: {climate_df.shape[0]} registros")
         
         # 2. Carregar dados de arboviroses
-        arbovirus_query = """
+        arbovirus_query = f"""
             SELECT 
                 data_coleta AS data,
                 municipio,
@@ -37,9 +59,11 @@ def load_data():
                 zika AS casos_zika,
                 chikungunya AS casos_chikungunya
             FROM dados_arboviroses
-            WHERE municipio IN ('Teófilo Otoni', 'Diamantina');
+            {where};
         """
-        arbovirus_df = pd.read_sql(arbovirus_query, conn)
+        with timer('db_query', table='dados_arboviroses'):
+            arbovirus_df = pd.read_sql(arbovirus_query, conn, params=params)
+        increment('rows_processed_total', arbovirus_df.shape[0], stage='load_data', table='dados_arboviroses')
         logging.info(f"Dados de arboviroses carregados: {arbovirus_df.shape[0]} registros")
         
         conn.close()
@@ -76,46 +100,22 @@ def load_data():
         logging.error(f"Erro ao carregar dados: {e}")
         return load_fallback_data()
 
+@timed('load_fallback_data')
 def load_fallback_data():
     """Carrega dados de fallback com informações completas"""
+    # Import local: synthetic_data importa MUNICIPIOS deste módulo
+    from src.synthetic_data import generate_synthetic_data
+    
     logging.warning("Carregando dados de fallback")
     
-    # Criar dados sintéticos completos
+    # Criar dados sintéticos completos (2 municípios, 12 meses)
     start_date = datetime.now() - relativedelta(months=12)
-    dates = [start_date + timedelta(days=i) for i in range(365)]
-    
-    data = {
-        'data': dates * 2,  # 2 municípios
-        'municipio': ['Teófilo Otoni']*365 + ['Diamantina']*365,
-        'temperatura': np.concatenate([
-            np.sin(np.linspace(0, 10, 365)) * 10 + 25,  # Teófilo Otoni
-            np.sin(np.linspace(0, 10, 365)) * 8 + 22     # Diamantina
-        ]),
-        'umidade': np.concatenate([
-            np.cos(np.linspace(0, 8, 365)) * 20 + 60,    # Teófilo Otoni
-            np.cos(np.linspace(0, 8, 365)) * 15 + 65      # Diamantina
-        ]),
-        'precipitacao': np.random.gamma(2, 5, 730),      # Distribuição de chuva
-        
-        # Casos com sazonalidade e correlação com chuva
-        'casos_dengue': np.random.poisson(
-            np.clip(np.random.gamma(2, 5, 730) * 0.5 + 
-            np.random.gamma(2, 2, 730), 10
-        ),
-        'casos_zika': np.random.poisson(
-            np.clip(np.random.gamma(1, 3, 730) * 0.3 + 
-            np.random.gamma(1, 1, 730), 5
-        ),
-        'casos_chikungunya': np.random.poisson(
-            np.clip(np.random.gamma(1, 2, 730) * 0.2 + 
-            np.random.gamma(1, 1, 730), 3
-        )
-    }
-    
-    df = pd.DataFrame(data)
-    
-    # Ajustar datas
-    df['data'] = pd.to_datetime(df['data'])
+    df = generate_synthetic_data(
+        n_municipios=2,
+        n_anos=1,
+        seed=int(os.getenv('SYNTHETIC_SEED', 42)),
+        start_date=start_date
+    )
     
     logging.warning(f"Dados sintéticos gerados: {df.shape[0]} registros")
     return df
\ No newline at end of file
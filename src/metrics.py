@@ -0,0 +1,188 @@
+import os
+import time
+import logging
+import cProfile
+import threading
+import functools
+from contextlib import contextmanager
+from datetime import datetime
+
+# Configurar logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+class MetricsRegistry:
+    """
+    Contadores e resumos (count/sum/max) em memória, seguros entre threads
+
+    Os tempos das etapas ficam no resumo `stage_duration_seconds` com o
+    rótulo `stage`; demais valores (tamanho de lote, tokens) usam `observe`.
+    """
+
+    def __init__(self, prefix='arbovirus'):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._summaries = {}
+        self._captures = {}
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    def increment(self, name, value=1, **labels):
+        """Soma `value` a um contador"""
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        """Registra uma observação em um resumo"""
+        key = self._key(name, labels)
+        with self._lock:
+            count, total, maximo = self._summaries.get(key, (0, 0.0, value))
+            self._summaries[key] = (count + 1, total + value, max(maximo, value))
+
+    @contextmanager
+    def timer(self, stage, **labels):
+        """Mede o tempo de um bloco: `with timer('load_data'): ...`"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.observe('stage_duration_seconds', elapsed, stage=stage, **labels)
+            amostras = self._captures.get(stage)
+            if amostras is not None:
+                amostras.append(elapsed)
+            logging.debug(f"⏱ {stage}: {elapsed * 1000:.1f}ms")
+
+    @contextmanager
+    def capture(self, *stages):
+        """
+        Guarda cada tempo individual das etapas dentro do bloco
+
+        Returns:
+            Dicionário {etapa: lista de segundos}, preenchido até o fim do bloco
+        """
+        amostras = {stage: [] for stage in stages}
+        with self._lock:
+            self._captures.update(amostras)
+        try:
+            yield amostras
+        finally:
+            with self._lock:
+                for stage in stages:
+                    self._captures.pop(stage, None)
+
+    def timed(self, stage=None, **labels):
+        """Decorador equivalente a `timer` (padrão: nome qualificado da função)"""
+        def decorator(func):
+            name = stage or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.timer(name, **labels):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def snapshot(self):
+        """Cópia dos valores atuais: {'counters': {...}, 'summaries': {...}}"""
+        with self._lock:
+            return {
+                'counters': dict(self._counters),
+                'summaries': dict(self._summaries)
+            }
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._summaries.clear()
+
+    def render_prometheus(self):
+        """Valores atuais no formato de texto do Prometheus"""
+        snapshot = self.snapshot()
+        lines = []
+
+        def fmt(name, labels):
+            if not labels:
+                return name
+            escaped = (
+                v.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+                for _, v in labels
+            )
+            pares = ','.join(f'{k}="{v}"' for (k, _), v in zip(labels, escaped))
+            return f'{name}{{{pares}}}'
+
+        for name in sorted({n for n, _ in snapshot['counters']}):
+            metric = f'{self.prefix}_{name}'
+            lines.append(f'# TYPE {metric} counter')
+            for (n, labels), value in sorted(snapshot['counters'].items()):
+                if n == name:
+                    lines.append(f'{fmt(metric, labels)} {value}')
+
+        for name in sorted({n for n, _ in snapshot['summaries']}):
+            metric = f'{self.prefix}_{name}'
+            lines.append(f'# TYPE {metric} summary')
+            maximos = []
+            for (n, labels), (count, total, maximo) in sorted(snapshot['summaries'].items()):
+                if n == name:
+                    lines.append(f'{fmt(metric + "_count", labels)} {count}')
+                    lines.append(f'{fmt(metric + "_sum", labels)} {total}')
+                    maximos.append(f'{fmt(metric + "_max", labels)} {maximo}')
+            lines.append(f'# TYPE {metric}_max gauge')
+            lines += maximos
+
+        return '\n'.join(lines) + '\n'
+
+    def log_summary(self):
+        """Registra no log o tempo total de cada etapa"""
+        for (name, labels), (count, total, maximo) in sorted(self.snapshot()['summaries'].items()):
+            if name == 'stage_duration_seconds':
+                rotulos = ', '.join(f'{k}={v}' for k, v in labels)
+                logging.info(f"⏱ {rotulos}: {count}x, total {total:.3f}s, máx {maximo:.3f}s")
+
+
+REGISTRY = MetricsRegistry()
+
+increment = REGISTRY.increment
+observe = REGISTRY.observe
+timer = REGISTRY.timer
+timed = REGISTRY.timed
+
+
+def register_metrics_endpoint(server, registry=REGISTRY, path='/metrics'):
+    """Expõe as métricas no servidor Flask do Dash (`app.server`)"""
+    from flask import Response
+
+    def metrics_view():
+        return Response(registry.render_prometheus(), mimetype='text/plain; version=0.0.4')
+
+    server.add_url_rule(path, 'metrics', metrics_view)
+
+
+@contextmanager
+def profile_run(output_dir=None):
+    """
+    Executa o bloco sob cProfile e grava `run_<timestamp>.prof`
+
+    Args:
+        output_dir: Diretório de saída (padrão: variável PROFILE_OUTPUT).
+            Sem diretório, o bloco roda sem profiling.
+    """
+    output_dir = output_dir or os.getenv('PROFILE_OUTPUT')
+    if not output_dir:
+        yield
+        return
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        os.makedirs(output_dir, exist_ok=True)
+        path = os.path.join(output_dir, f"run_{datetime.now():%Y%m%d_%H%M%S}.prof")
+        profiler.dump_stats(path)
+        logging.info(f"Profile gravado em {path}")
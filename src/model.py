@@ -1,8 +1,154 @@
 from transformers import AutoModelForSequenceClassification, AutoTokenizer
 import torch
+import numpy as np
 import pandas as pd
 import os
+import logging
+import weakref
+from src.metrics import timed, timer, increment, observe
 
+REPORT_TEMPLATE = (
+    "Relatório de {municipio} em {data}: "
+    "Temp: {temperatura}°C, Umidade: {umidade}%, "
+    "Precipitação: {precipitacao}mm. "
+    "Casos: D{casos_dengue} Z{casos_zika} C{casos_chikungunya}"
+)
+
+NUMERIC_FIELDS = [
+    'temperatura', 'umidade', 'precipitacao',
+    'casos_dengue', 'casos_zika', 'casos_chikungunya'
+]
+
+class TemplateEncoder:
+    """
+    Codifica o relatório de `predict` sem rodar o tokenizer na frase inteira
+
+    O pré-tokenizador do BERT nunca junta tokens através de espaços, então o
+    template é dividido em palavras: trechos fixos são tokenizados uma vez e
+    cada palavra com campo (município, data, valores arredondados) é
+    memorizada pelo texto formatado. Os `input_ids` saem da concatenação dos
+    pedaços em NumPy.
+    """
+
+    def __init__(self, tokenizer, template=REPORT_TEMPLATE, decimals=2, max_length=512):
+        self.tokenizer = tokenizer
+        self.decimals = decimals
+        self.max_length = max_length
+        self.hits = 0
+        self.misses = 0
+        self.verified = False
+        self.enabled = True
+
+        # Tokens especiais ao redor do texto ([CLS] ... [SEP] no BERT)
+        completo = tokenizer(template)['input_ids']
+        texto = tokenizer(template, add_special_tokens=False)['input_ids']
+        i = next(i for i in range(len(completo)) if completo[i:i + len(texto)] == texto)
+        self.prefix = np.array(completo[:i], dtype=np.int64)
+        self.suffix = np.array(completo[i + len(texto):], dtype=np.int64)
+        self.input_names = tokenizer.model_input_names
+
+        # Partes: ids fixos (np.ndarray) ou (campo, palavra do template)
+        self.parts = []
+        self.caches = {}
+        fixas = []
+        for palavra in template.split(' '):
+            if '{' not in palavra:
+                fixas.append(palavra)
+                continue
+            if fixas:
+                self.parts.append(self._tokenize(' '.join(fixas)))
+                fixas = []
+            campo = palavra[palavra.index('{') + 1:palavra.index('}')]
+            self.parts.append((campo, palavra))
+            self.caches[campo] = {}
+        if fixas:
+            self.parts.append(self._tokenize(' '.join(fixas)))
+        self.template = template
+
+    def _tokenize(self, text):
+        ids = self.tokenizer(text, add_special_tokens=False)['input_ids']
+        return np.array(ids, dtype=np.int64)
+
+    def format_values(self, row):
+        """Valores do template com os campos float arredondados (inteiros ficam como estão)"""
+        values = {'municipio': row['municipio'], 'data': row['data']}
+        for campo in NUMERIC_FIELDS:
+            v = row[campo]
+            # Somar 0.0 evita o texto '-0.0'
+            values[campo] = int(v) if pd.api.types.is_integer(v) else round(float(v), self.decimals) + 0.0
+        return values
+
+    def format_text(self, row):
+        """Texto do relatório (o mesmo que o tokenizer receberia)"""
+        return self.template.format(**self.format_values(row))
+
+    def encode_ids(self, row):
+        """`input_ids` do relatório, incluindo os tokens especiais"""
+        values = self.format_values(row)
+        pedacos = [self.prefix]
+        for part in self.parts:
+            if isinstance(part, np.ndarray):
+                pedacos.append(part)
+                continue
+            campo, palavra = part
+            texto = palavra.format(**{campo: values[campo]})
+            cache = self.caches[campo]
+            ids = cache.get(texto)
+            if ids is None:
+                self.misses += 1
+                ids = cache[texto] = self._tokenize(texto)
+            else:
+                self.hits += 1
+            pedacos.append(ids)
+        pedacos.append(self.suffix)
+        ids = np.concatenate(pedacos)
+
+        # Mesmo corte do tokenizer com truncation=True
+        if ids.shape[0] > self.max_length:
+            ids = np.concatenate([ids[:self.max_length - self.suffix.shape[0]], self.suffix])
+        return ids
+
+    def encode(self, row):
+        """Tensores de entrada do modelo para uma linha (Series ou dicionário)"""
+        if not self.enabled:
+            return self.tokenizer(
+                self.format_text(row), return_tensors="pt", truncation=True, max_length=self.max_length
+            )
+
+        ids = torch.from_numpy(self.encode_ids(row)).unsqueeze(0)
+        inputs = {'input_ids': ids}
+        if 'token_type_ids' in self.input_names:
+            inputs['token_type_ids'] = torch.zeros_like(ids)
+        if 'attention_mask' in self.input_names:
+            inputs['attention_mask'] = torch.ones_like(ids)
+        return inputs
+
+    def verify(self, df):
+        """
+        Compara a codificação rápida com o tokenizer nas linhas de `df`
+
+        Returns:
+            True se todos os `input_ids` forem idênticos
+        """
+        for row in df.to_dict('records'):
+            esperado = self.tokenizer(
+                self.format_text(row), truncation=True, max_length=self.max_length
+            )['input_ids']
+            if self.encode_ids(row).tolist() != list(esperado):
+                logging.warning(f"Codificação rápida difere do tokenizer: {self.format_text(row)!r}")
+                return False
+        return True
+
+_encoders = weakref.WeakKeyDictionary()
+
+def get_template_encoder(tokenizer):
+    """Encoder do template associado ao tokenizer (reaproveita os caches)"""
+    encoder = _encoders.get(tokenizer)
+    if encoder is None:
+        encoder = _encoders[tokenizer] = TemplateEncoder(tokenizer)
+    return encoder
+
+@timed('load_model')
 def load_model():
     model_name = "mmcleige/arbovirus_bert_base_LR.5e-5_N.5"
     
@@ -14,23 +160,29 @@ def load_model():
         print(f"🔥 Erro ao carregar modelo: {e}")
         return None, None
 
+@timed('predict')
 def predict(df, model, tokenizer):
     if model is None or tokenizer is None:
         return pd.DataFrame()
     
     results = []
     
-    for _, row in df.iterrows():
-        # Criar texto para classificação
-        text = (
-            f"Relatório de {row['municipio']} em {row['data']}: "
-            f"Temp: {row['temperatura']}°C, Umidade: {row['umidade']}%, "
-            f"Precipitação: {row['precipitacao']}mm. "
-            f"Casos: D{row['casos_dengue']} Z{row['casos_zika']} C{row['casos_chikungunya']}"
-        )
+    # Codificação pré-tokenizada do relatório, conferida com o tokenizer na primeira linha
+    encoder = get_template_encoder(tokenizer)
+    if not encoder.verified and not df.empty:
+        encoder.enabled = encoder.verify(df.head(1))
+        encoder.verified = True
+    hits, misses = encoder.hits, encoder.misses
+    
+    for row in df.to_dict('records'):
+        with timer('predict.tokenize'):
+            inputs = encoder.encode(row)
+        observe('predict_batch_size', inputs['input_ids'].shape[0])
+        observe('predict_tokens_per_batch', inputs['input_ids'].numel())
+        increment('tokens_total', inputs['input_ids'].numel(), stage='predict')
         
-        inputs = tokenizer(text, return_tensors="pt", truncation=True, max_length=512)
-        outputs = model(**inputs)
+        with timer('predict.forward'):
+            outputs = model(**inputs)
         probs = torch.nn.functional.softmax(outputs.logits, dim=-1)
         
         results.append({
@@ -42,4 +194,7 @@ def predict(df, model, tokenizer):
             'risk_level': max(probs[0]).item()
         })
     
+    increment('template_cache_hits_total', encoder.hits - hits)
+    increment('template_cache_misses_total', encoder.misses - misses)
+    increment('rows_processed_total', len(results), stage='predict')
     return pd.DataFrame(results)
\ No newline at end of file
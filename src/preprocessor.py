@@ -2,6 +2,7 @@ import pandas as pd
 import numpy as np
 from sklearn.preprocessing import StandardScaler
 import logging
+from src.metrics import timed, increment
 
 # Configurar logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -10,6 +11,7 @@ class DataPreprocessor:
     def __init__(self):
         self.scalers = {}
     
+    @timed('preprocess.clean_data')
     def clean_data(self, df):
         """Limpeza e tratamento de dados"""
         # Verificar colunas essenciais
@@ -43,6 +45,7 @@ class DataPreprocessor:
         
         return df
 
+    @timed('preprocess.create_features')
     def create_features(self, df):
         """Engenharia de features"""
         # Converter data
@@ -71,6 +74,7 @@ class DataPreprocessor:
         
         return df
 
+    @timed('preprocess.normalize_data')
     def normalize_data(self, df):
         """Normalização dos dados numéricos"""
         # Colunas para normalizar
@@ -89,9 +93,11 @@ class DataPreprocessor:
         
         return df
 
+    @timed('preprocess')
     def preprocess(self, df):
         """Pipeline completo de pré-processamento"""
         logging.info("Iniciando pré-processamento de dados")
+        increment('rows_processed_total', df.shape[0], stage='preprocess', direction='in')
         
         # Etapas de processamento
         df = self.clean_data(df)
@@ -101,5 +107,10 @@ class DataPreprocessor:
         # Remover valores nulos resultantes de lags
         df = df.dropna()
         
+        increment('rows_processed_total', df.shape[0], stage='preprocess', direction='out')
         logging.info(f"Pré-processamento concluído: {df.shape[0]} registros")
-        return df
\ No newline at end of file
+        return df
+
+def preprocess_data(df):
+    """Atalho para o pipeline completo de pré-processamento"""
+    return DataPreprocessor().preprocess(df)
\ No newline at end of file
@@ -0,0 +1,338 @@
+import os
+import sqlite3
+import logging
+import argparse
+import numpy as np
+import pandas as pd
+from src.data_loader import MUNICIPIOS
+
+# Configurar logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+def municipality_names(n_municipios):
+    """Nomes dos municípios sintéticos (os municípios reais primeiro)"""
+    names = MUNICIPIOS[:n_municipios]
+    names += [f'Municipio {i:05d}' for i in range(len(names) + 1, n_municipios + 1)]
+    return np.array(names, dtype=object)
+
+
+PARAM_RANGES = {
+    'temp_base': (19, 27),
+    'temp_amp': (2, 6),
+    'umid_base': (55, 75),
+    'umid_amp': (5, 15),
+    'chuva_escala': (2, 7),
+    'fase': (-0.5, 0.5),
+    'base_dengue': (1, 8),
+    'base_zika': (0.2, 2),
+    'base_chikungunya': (0.2, 3),
+}
+
+
+def _stack(rngs, draw):
+    """Empilha um sorteio por município (uma linha por gerador)"""
+    return np.stack([draw(rng) for rng in rngs])
+
+
+def _municipality_params(rngs):
+    """Sorteia o perfil climático e epidemiológico de cada município"""
+    sorteios = _stack(rngs, lambda rng: [rng.uniform(lo, hi) for lo, hi in PARAM_RANGES.values()])
+    return {nome: sorteios[:, j] for j, nome in enumerate(PARAM_RANGES)}
+
+
+def _moving_average(values, window):
+    """Média móvel ao longo do eixo dos dias (janela à esquerda)"""
+    csum = np.cumsum(values, axis=-1)
+    csum[..., window:] = csum[..., window:] - csum[..., :-window]
+    counts = np.minimum(np.arange(1, values.shape[-1] + 1), window)
+    return csum / counts
+
+
+def _generate_daily(rngs, params, dates):
+    """Gera as séries diárias (municípios x dias) de forma vetorizada"""
+    n_dias = len(dates)
+    doy = dates.dayofyear.to_numpy()
+
+    # Sazonalidade anual: verão chuvoso e quente no hemisfério sul
+    sazonal = np.cos(2 * np.pi * (doy[None, :] - 15) / 365.25 + params['fase'][:, None])
+
+    temperatura = (
+        params['temp_base'][:, None] + params['temp_amp'][:, None] * sazonal
+        + _stack(rngs, lambda rng: rng.normal(0, 1.5, n_dias))
+    )
+    # Limite de 90%: o ciclo horário (±10) continua dentro de 0-100 sem corte
+    umidade = np.clip(
+        params['umid_base'][:, None] + params['umid_amp'][:, None] * sazonal
+        + _stack(rngs, lambda rng: rng.normal(0, 5, n_dias)),
+        10, 90
+    )
+    chove = _stack(rngs, lambda rng: rng.random(n_dias)) < np.clip(0.45 + 0.35 * sazonal, 0.05, 0.95)
+    escala = params['chuva_escala'][:, None] * (1 + 0.5 * sazonal)
+    precipitacao = _stack(rngs, lambda rng: rng.gamma(2, 1, n_dias)) * escala * chove
+
+    # Casos respondem à chuva e à temperatura acumuladas nas semanas anteriores
+    chuva_acumulada = _moving_average(precipitacao, 21)
+    calor = np.clip(_moving_average(temperatura, 14) - 18, 0, None)
+    efeito_clima = 1 + 0.15 * chuva_acumulada + 0.1 * calor
+
+    casos = {}
+    for doenca in ['dengue', 'zika', 'chikungunya']:
+        lam = params[f'base_{doenca}'][:, None] * efeito_clima
+        casos[doenca] = np.stack([rng.poisson(linha) for rng, linha in zip(rngs, lam)])
+
+    return temperatura, umidade, precipitacao, casos
+
+
+def _generate_hourly(rngs, dates, temperatura, umidade, precipitacao):
+    """Distribui as séries diárias em 24 leituras horárias consistentes"""
+    k, n_dias = temperatura.shape
+    horas = np.arange(24)
+    ciclo = np.sin(2 * np.pi * (horas - 9) / 24)
+
+    # Ciclo diário com média zero: a média por dia reproduz a série diária
+    temp_h = temperatura[:, :, None] + 4 * ciclo[None, None, :]
+    umid_h = umidade[:, :, None] - 10 * ciclo[None, None, :]
+
+    # Pesos aleatórios que somam 1 em cada dia preservam o total diário
+    pesos = _stack(rngs, lambda rng: rng.gamma(0.3, 1, (n_dias, 24)))
+    pesos /= pesos.sum(axis=2, keepdims=True)
+    precip_h = precipitacao[:, :, None] * pesos
+
+    data_hora = (
+        dates.to_numpy().astype('datetime64[h]')[:, None] + horas.astype('timedelta64[h]')
+    ).ravel()
+
+    return data_hora, temp_h.reshape(k, -1), umid_h.reshape(k, -1), precip_h.reshape(k, -1)
+
+
+def iter_synthetic_chunks(n_municipios=2, n_anos=1, seed=42, start_date='2023-01-01',
+                          hourly=False, raw=False, chunk_municipios=256):
+    """
+    Gera dados sintéticos em blocos de municípios
+
+    Args:
+        n_municipios: Quantidade de municípios
+        n_anos: Quantidade de anos (365 dias cada)
+        seed: Semente do gerador (None para dados não reprodutíveis)
+        start_date: Primeiro dia da série
+        hourly: Incluir leituras horárias no formato de `dados_climaticos`
+        raw: Incluir as tabelas brutas `dados_climaticos` (diária, se
+            `hourly` for falso) e `dados_arboviroses`
+        chunk_municipios: Municípios por bloco
+
+    Returns:
+        Iterador de dicionários {tabela: DataFrame}. A chave 'diario' tem o
+        mesmo formato de `load_data`. Cada município tem seu próprio gerador,
+        então os dados de um município dependem só da semente e da sua
+        posição (não de `n_municipios` nem de `chunk_municipios`).
+    """
+    dates = pd.date_range(pd.Timestamp(start_date).normalize(), periods=365 * n_anos, freq='D')
+    names = municipality_names(n_municipios)
+    n_chunks = -(-n_municipios // chunk_municipios)
+
+    # Equivalente a SeedSequence(seed).spawn(n_municipios), sem criar todos de uma vez
+    entropy = np.random.SeedSequence(seed).entropy
+
+    for i in range(n_chunks):
+        inicio, fim = i * chunk_municipios, min((i + 1) * chunk_municipios, n_municipios)
+        rngs = [
+            np.random.default_rng(np.random.SeedSequence(entropy, spawn_key=(j,)))
+            for j in range(inicio, fim)
+        ]
+        chunk_params = _municipality_params(rngs)
+        chunk_names = names[inicio:fim]
+        k = fim - inicio
+
+        temperatura, umidade, precipitacao, casos = _generate_daily(rngs, chunk_params, dates)
+
+        municipio = np.repeat(chunk_names, len(dates))
+        data = np.tile(dates.to_numpy(), k)
+        tabelas = {
+            'diario': pd.DataFrame({
+                'data': data,
+                'municipio': municipio,
+                'temperatura': temperatura.ravel(),
+                'umidade': umidade.ravel(),
+                'precipitacao': precipitacao.ravel(),
+                'casos_dengue': casos['dengue'].ravel(),
+                'casos_zika': casos['zika'].ravel(),
+                'casos_chikungunya': casos['chikungunya'].ravel()
+            })
+        }
+
+        if hourly:
+            data_hora, temp_h, umid_h, precip_h = _generate_hourly(
+                rngs, dates, temperatura, umidade, precipitacao
+            )
+            tabelas['dados_climaticos'] = pd.DataFrame({
+                'data_hora': np.tile(data_hora, k),
+                'municipio': np.repeat(chunk_names, len(data_hora)),
+                'temperatura_media': temp_h.ravel(),
+                'umidade_media': umid_h.ravel(),
+                'precipitacao': precip_h.ravel()
+            })
+        elif raw:
+            # Sem leituras horárias: uma leitura por dia
+            tabelas['dados_climaticos'] = pd.DataFrame({
+                'data_hora': data,
+                'municipio': municipio,
+                'temperatura_media': temperatura.ravel(),
+                'umidade_media': umidade.ravel(),
+                'precipitacao': precipitacao.ravel()
+            })
+
+        if raw:
+            tabelas['dados_arboviroses'] = pd.DataFrame({
+                'data_coleta': data,
+                'municipio': municipio,
+                'dengue': casos['dengue'].ravel(),
+                'zika': casos['zika'].ravel(),
+                'chikungunya': casos['chikungunya'].ravel()
+            })
+
+        yield tabelas
+
+
+def generate_synthetic_data(n_municipios=2, n_anos=1, seed=42, start_date='2023-01-01',
+                            chunk_municipios=256):
+    """Gera o DataFrame diário completo (mesmo formato de `load_data`)"""
+    chunks = iter_synthetic_chunks(
+        n_municipios, n_anos, seed, start_date, chunk_municipios=chunk_municipios
+    )
+    return pd.concat([tabelas['diario'] for tabelas in chunks], ignore_index=True)
+
+
+def write_parquet(chunks, output_dir):
+    """
+    Grava cada tabela dos blocos em um arquivo Parquet, bloco a bloco
+
+    Args:
+        chunks: Iterador retornado por `iter_synthetic_chunks`
+        output_dir: Diretório de saída (um arquivo `<tabela>.parquet` por tabela)
+
+    Returns:
+        Dicionário {tabela: número de registros gravados}
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("pyarrow é necessário para gravar Parquet: pip install pyarrow") from e
+
+    os.makedirs(output_dir, exist_ok=True)
+    writers, totais = {}, {}
+    try:
+        for tabelas in chunks:
+            for nome, df in tabelas.items():
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                if nome not in writers:
+                    path = os.path.join(output_dir, f'{nome}.parquet')
+                    writers[nome] = pq.ParquetWriter(path, table.schema)
+                    totais[nome] = 0
+                writers[nome].write_table(table)
+                totais[nome] += df.shape[0]
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    logging.info(f"Parquet gravado em {output_dir}: {totais}")
+    return totais
+
+
+def _sql_type(dtype):
+    """Tipo SQL equivalente a um dtype do pandas"""
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return 'TIMESTAMP'
+    if pd.api.types.is_integer_dtype(dtype):
+        return 'INTEGER'
+    if pd.api.types.is_float_dtype(dtype):
+        return 'DOUBLE PRECISION'
+    return 'TEXT'
+
+
+def write_sql(chunks, con, tables=('dados_climaticos', 'dados_arboviroses'), page_size=10000,
+              append=False):
+    """
+    Grava as tabelas brutas em um banco (Postgres ou SQLite), bloco a bloco
+
+    Args:
+        chunks: Iterador retornado por `iter_synthetic_chunks`
+        con: Conexão psycopg2, sqlite3 ou engine SQLAlchemy
+        tables: Tabelas a gravar
+        page_size: Registros por lote de INSERT
+        append: Acrescentar às tabelas existentes em vez de substituí-las
+
+    Returns:
+        Dicionário {tabela: número de registros gravados}
+    """
+    totais = {}
+    for tabelas in chunks:
+        for nome in tables:
+            df = tabelas.get(nome)
+            if df is None:
+                continue
+
+            # O primeiro bloco de cada tabela substitui o conteúdo anterior
+            substituir = not append and nome not in totais
+
+            if isinstance(con, sqlite3.Connection) or not hasattr(con, 'cursor'):
+                if_exists = 'replace' if substituir else 'append'
+                df.to_sql(nome, con, if_exists=if_exists, index=False, chunksize=page_size)
+            else:
+                from psycopg2.extras import execute_values
+
+                colunas = ', '.join(f'{col} {_sql_type(df[col].dtype)}' for col in df.columns)
+                with con.cursor() as cur:
+                    if substituir:
+                        cur.execute(f"DROP TABLE IF EXISTS {nome}")
+                    cur.execute(f"CREATE TABLE IF NOT EXISTS {nome} ({colunas})")
+                    execute_values(
+                        cur,
+                        f"INSERT INTO {nome} ({', '.join(df.columns)}) VALUES %s",
+                        df.astype(object).itertuples(index=False, name=None),
+                        page_size=page_size
+                    )
+                con.commit()
+
+            totais[nome] = totais.get(nome, 0) + df.shape[0]
+
+    logging.info(f"Tabelas gravadas no banco: {totais}")
+    return totais
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gerador de dados sintéticos de arboviroses")
+    parser.add_argument('--municipios', type=int, default=2)
+    parser.add_argument('--anos', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--inicio', default='2023-01-01')
+    parser.add_argument('--horario', action='store_true', help="Gerar leituras horárias de dados_climaticos")
+    parser.add_argument('--chunk', type=int, default=256, help="Municípios por bloco")
+    parser.add_argument('--parquet', help="Diretório de saída Parquet")
+    parser.add_argument('--sqlite', help="Arquivo SQLite de saída (tabelas brutas)")
+    parser.add_argument('--append', action='store_true',
+                        help="Acrescentar às tabelas SQLite existentes em vez de substituí-las")
+    args = parser.parse_args()
+
+    if not args.parquet and not args.sqlite:
+        parser.error("Informe --parquet e/ou --sqlite")
+
+    def chunks():
+        return iter_synthetic_chunks(
+            args.municipios, args.anos, args.seed, args.inicio,
+            hourly=args.horario, raw=True, chunk_municipios=args.chunk
+        )
+
+    if args.parquet:
+        write_parquet(chunks(), args.parquet)
+    if args.sqlite:
+        con = sqlite3.connect(args.sqlite)
+        try:
+            write_sql(chunks(), con, append=args.append)
+        finally:
+            con.close()
+
+
+if __name__ == "__main__":
+    main()